@@ -6,13 +6,20 @@ package main
 import "C"
 
 import (
+	"bytes"
+	"container/list"
 	"fmt"
+	"hash/maphash"
 	"io"
 	"net"
 	"net/url"
 	"os"
+	"strconv"
 	"sync"
+	"sync/atomic"
+	"time"
 	"unicode/utf8"
+	"unsafe"
 
 	"github.com/cristalhq/base64"
 
@@ -27,6 +34,24 @@ var (
 	startOnce sync.Once
 )
 
+/*
+Optional bounds on the tls-client session cache, which otherwise keeps every
+session until DestroySession is called. Both are disabled (0) by default:
+  - HREQUESTS_MAX_SESSIONS: evict the least recently used session past this count
+  - HREQUESTS_SESSION_TTL_SECONDS: evict sessions idle for longer than this
+*/
+var (
+	maxSessions = envInt("HREQUESTS_MAX_SESSIONS")
+	sessionTTL  = time.Duration(envInt("HREQUESTS_SESSION_TTL_SECONDS")) * time.Second
+	sessions    = newSessionTracker()
+)
+
+func init() {
+	// Every response gets a uuid. Have the uuid package fill ids from a
+	// pooled block of crypto/rand bytes instead of a read per id
+	uuid.EnableRandPool()
+}
+
 /*
 Offers a http server that can be used to make requests to tls-client
 */
@@ -48,11 +73,8 @@ type ResponseWrapper struct {
 	IsHistory bool        `json:"isHistory"`
 	Response  *Response   `json:"response,omitempty"`
 	History   []*Response `json:"history,omitempty"`
-}
-
-type IndexedResponseWrapper struct {
-	int
-	*ResponseWrapper
+	// milliseconds spent on this request, set by multiRequestHandler
+	Elapsed int64 `json:"elapsed"`
 }
 
 type ExtendedRequestInput struct {
@@ -61,108 +83,96 @@ type ExtendedRequestInput struct {
 	DetectEncoding bool `json:"detectEncoding"`
 }
 
-func extractBody(w http.ResponseWriter, r *http.Request) []byte {
+func decodeBody(w http.ResponseWriter, r *http.Request, v interface{}, errMsg string) bool {
+	// Decode the JSON request body straight from the connection into v,
+	// without first buffering the whole body with io.ReadAll
 	if r.Method != http.MethodPost {
 		http.Error(w, "Only POST method is allowed", http.StatusMethodNotAllowed)
-		return nil
-	}
-
-	body, err := io.ReadAll(r.Body)
-	if err != nil {
-		http.Error(w, "Failed to read request body", http.StatusInternalServerError)
-		return nil
+		return false
 	}
 	defer r.Body.Close()
 
-	return body
+	if err := json.NewDecoder(r.Body).Decode(v); err != nil {
+		http.Error(w, errMsg, http.StatusBadRequest)
+		return false
+	}
+	return true
 }
 
 func requestHandler(w http.ResponseWriter, r *http.Request) {
 	/*
 		Used to handle a single request
 	*/
-	rawData := extractBody(w, r)
-	// unmarshal the request input as ExtendedRequestInput
+	// decode the request input as ExtendedRequestInput
 	params := ExtendedRequestInput{}
-	err := json.Unmarshal(rawData, &params)
-	if err != nil {
-		http.Error(w, "Invalid JSON format for request", http.StatusBadRequest)
+	if !decodeBody(w, r, &params, "Invalid JSON format for request") {
 		return
 	}
 	// call the request function and write the response back to the client
-	var jsonResponse []byte
+	var wrapper ResponseWrapper
 	if params.WantHistory && params.RequestInput.FollowRedirects {
 		// get full history
 		historyResponses := requestHistory(&params)
-		jsonResponse, err = json.Marshal(ResponseWrapper{History: *historyResponses, IsHistory: true})
+		wrapper = ResponseWrapper{History: *historyResponses, IsHistory: true}
 	} else {
 		// get single response
 		response := request(&params)
-		jsonResponse, err = json.Marshal(ResponseWrapper{Response: response, IsHistory: false})
+		wrapper = ResponseWrapper{Response: response, IsHistory: false}
 	}
 
-	if err != nil {
-		http.Error(w, "Failed to marshal response", http.StatusInternalServerError)
-		return
-	}
-	w.Write(jsonResponse)
+	writeJSON(w, wrapper, "Failed to marshal response")
 }
 
 func multiRequestHandler(w http.ResponseWriter, r *http.Request) {
-	rawData := extractBody(w, r)
-	// unmarshal the request input as []ExtendedRequestInput
+	// decode the request input as []ExtendedRequestInput
 	requests := []ExtendedRequestInput{}
-	err := json.Unmarshal(rawData, &requests)
-	if err != nil {
-		http.Error(w, "Invalid JSON format for multirequest", http.StatusBadRequest)
+	if !decodeBody(w, r, &requests, "Invalid JSON format for multirequest") {
 		return
 	}
 
+	// each goroutine owns a distinct slot of results, so no channel or
+	// lock is needed to collect them
 	results := make([]*ResponseWrapper, len(requests))
-	resultsCh := make(chan *IndexedResponseWrapper, len(requests))
 	var wg sync.WaitGroup
 
-	for idx, param := range requests {
-		param_ptr := param // create local pointer
+	for idx := range requests {
 		wg.Add(1)
 		go func(i int, param_ptr *ExtendedRequestInput) {
 			defer wg.Done()
-			var resWrapper *ResponseWrapper
+			start := time.Now()
 			if param_ptr.WantHistory && param_ptr.RequestInput.FollowRedirects {
-				resWrapper = &ResponseWrapper{
+				results[i] = &ResponseWrapper{
 					IsHistory: true,
 					History:   *requestHistory(param_ptr),
 				}
 			} else {
-				resWrapper = &ResponseWrapper{
+				results[i] = &ResponseWrapper{
 					IsHistory: false,
 					Response:  request(param_ptr),
 				}
 			}
-			resultsCh <- &IndexedResponseWrapper{i, resWrapper}
-		}(idx, &param_ptr)
+			// timed per request, since the batch finishes with its slowest
+			results[i].Elapsed = time.Since(start).Milliseconds()
+		}(idx, &requests[idx])
 	}
+	wg.Wait()
 
-	// Wait for all goroutines to finish and close the results channel
-	go func() {
-		wg.Wait()
-		close(resultsCh)
-	}()
-
-	// Collect results from the channel
-	for indexedWrapper := range resultsCh {
-		results[indexedWrapper.int] = indexedWrapper.ResponseWrapper
-	}
+	// Write the results back to the client as a JSON array
+	writeJSON(w, results, "Failed to marshal results")
+}
 
-	// Marshal the results into a JSON array
-	resultsJson, err := json.Marshal(results)
-	if err != nil {
-		http.Error(w, "Failed to marshal results", http.StatusInternalServerError)
-		return
+func writeJSON(w http.ResponseWriter, v interface{}, errMsg string) {
+	// Encode straight into the response writer. The encoder writes from its
+	// pooled buffer, skipping the extra copy of the whole payload (bodies
+	// included) that json.Marshal returns
+	w.Header().Set("Content-Type", "application/json")
+	enc := json.NewEncoder(w)
+	// bodies are mostly HTML; escaping <, > and & to \u00XX only bloats the
+	// payload, and the client is JSON.parse, not a browser
+	enc.SetEscapeHTML(false)
+	if err := enc.Encode(v); err != nil {
+		http.Error(w, errMsg, http.StatusInternalServerError)
 	}
-
-	// Write the response back to the client
-	w.Write(resultsJson)
 }
 
 func pingHandler(w http.ResponseWriter, r *http.Request) {
@@ -206,9 +216,18 @@ func startServer(port string) {
 	mux.HandleFunc("/multirequest", multiRequestHandler)
 	mux.HandleFunc("/ping", pingHandler)
 
+	if sessionTTL > 0 {
+		go sessions.sweep(sessionTTL)
+	}
+
+	// net/http already serves each connection on its own goroutine across
+	// all cores; the idle timeout only needs to outlive the client's
+	// keep-alive window so pooled connections are reused, not redialed
 	srv = &http.Server{
-		Addr:    ":" + port,
-		Handler: mux,
+		Addr:              ":" + port,
+		Handler:           mux,
+		ReadHeaderTimeout: 10 * time.Second,
+		IdleTimeout:       90 * time.Second,
 	}
 
 	// start server
@@ -240,14 +259,202 @@ func StopServer() {
 
 //export DestroyAll
 func DestroyAll() {
+	sessions.reset()
 	tls_client_cffi.ClearSessionCache()
 }
 
 //export DestroySession
 func DestroySession(sessionId string) {
+	sessions.forget(sessionId)
 	tls_client_cffi.RemoveSession(sessionId)
 }
 
+func envInt(name string) int {
+	n, err := strconv.Atoi(os.Getenv(name))
+	if err != nil || n < 0 {
+		return 0
+	}
+	return n
+}
+
+type sessionEntry struct {
+	id       string
+	lastUsed time.Time
+}
+
+// number of independently locked shards; must be a power of two
+const sessionShards = 16
+
+type sessionShard struct {
+	// tracks session use order for eviction; front is most recently used
+	mu       sync.Mutex
+	order    *list.List
+	elements map[string]*list.Element
+}
+
+// least recently used entry in the shard, skipping the protected session
+func (sh *sessionShard) tail(protect string) *list.Element {
+	el := sh.order.Back()
+	if el != nil && el.Value.(*sessionEntry).id == protect {
+		el = el.Prev()
+	}
+	return el
+}
+
+type sessionTracker struct {
+	// sessions are spread over shards by id hash so concurrent requests on
+	// unrelated sessions never contend for the same lock. Each shard is kept
+	// in use order, so the least recently used session overall is the oldest
+	// of the shard tails
+	seed   maphash.Seed
+	count  atomic.Int64
+	shards [sessionShards]sessionShard
+
+	// serializes evictions so concurrent inserts can't evict past the cap
+	evictMu sync.Mutex
+}
+
+func newSessionTracker() *sessionTracker {
+	t := &sessionTracker{seed: maphash.MakeSeed()}
+	for i := range t.shards {
+		t.shards[i].order = list.New()
+		t.shards[i].elements = make(map[string]*list.Element)
+	}
+	return t
+}
+
+func (t *sessionTracker) shard(sessionId string) *sessionShard {
+	return &t.shards[maphash.String(t.seed, sessionId)&(sessionShards-1)]
+}
+
+func (t *sessionTracker) touch(sessionId string) {
+	// mark a session as used, evicting least recently used sessions past maxSessions
+	if maxSessions == 0 && sessionTTL == 0 {
+		return
+	}
+	sh := t.shard(sessionId)
+	sh.mu.Lock()
+	el, ok := sh.elements[sessionId]
+	if ok {
+		el.Value.(*sessionEntry).lastUsed = time.Now()
+		sh.order.MoveToFront(el)
+	} else {
+		sh.elements[sessionId] = sh.order.PushFront(&sessionEntry{id: sessionId, lastUsed: time.Now()})
+		t.count.Add(1)
+	}
+	sh.mu.Unlock()
+
+	// only a new session can push the count past the cap
+	if !ok && maxSessions > 0 && t.count.Load() > int64(maxSessions) {
+		t.evict(sessionId)
+	}
+}
+
+func (t *sessionTracker) evict(protect string) {
+	// evict least recently used sessions across all shards until the count is
+	// back within maxSessions, never evicting the session that triggered it
+	var evicted []string
+	t.evictMu.Lock()
+	for t.count.Load() > int64(maxSessions) {
+		id, ok := t.evictOldest(protect)
+		if !ok {
+			break
+		}
+		evicted = append(evicted, id)
+	}
+	t.evictMu.Unlock()
+
+	// close evicted sessions outside the locks
+	for _, id := range evicted {
+		tls_client_cffi.RemoveSession(id)
+	}
+}
+
+func (t *sessionTracker) evictOldest(protect string) (string, bool) {
+	for {
+		// find the oldest shard tail, holding one shard lock at a time
+		var (
+			oldest   *sessionShard
+			entry    *sessionEntry
+			lastUsed time.Time
+		)
+		for i := range t.shards {
+			sh := &t.shards[i]
+			sh.mu.Lock()
+			if el := sh.tail(protect); el != nil {
+				e := el.Value.(*sessionEntry)
+				if entry == nil || e.lastUsed.Before(lastUsed) {
+					oldest, entry, lastUsed = sh, e, e.lastUsed
+				}
+			}
+			sh.mu.Unlock()
+		}
+		if entry == nil {
+			return "", false
+		}
+
+		// remove it unless it was touched or removed since the scan
+		oldest.mu.Lock()
+		if el := oldest.tail(protect); el != nil && el.Value == entry && entry.lastUsed.Equal(lastUsed) {
+			id := t.removeLocked(oldest, el)
+			oldest.mu.Unlock()
+			return id, true
+		}
+		oldest.mu.Unlock()
+	}
+}
+
+func (t *sessionTracker) forget(sessionId string) {
+	sh := t.shard(sessionId)
+	sh.mu.Lock()
+	if el, ok := sh.elements[sessionId]; ok {
+		t.removeLocked(sh, el)
+	}
+	sh.mu.Unlock()
+}
+
+func (t *sessionTracker) reset() {
+	for i := range t.shards {
+		sh := &t.shards[i]
+		sh.mu.Lock()
+		t.count.Add(-int64(sh.order.Len()))
+		sh.order.Init()
+		sh.elements = make(map[string]*list.Element)
+		sh.mu.Unlock()
+	}
+}
+
+func (t *sessionTracker) removeLocked(sh *sessionShard, el *list.Element) string {
+	id := sh.order.Remove(el).(*sessionEntry).id
+	delete(sh.elements, id)
+	t.count.Add(-1)
+	return id
+}
+
+func (t *sessionTracker) sweep(ttl time.Duration) {
+	// periodically evict sessions that have been idle for longer than ttl
+	interval := ttl / 10
+	if interval < time.Second {
+		interval = time.Second
+	}
+	for range time.Tick(interval) {
+		cutoff := time.Now().Add(-ttl)
+		for i := range t.shards {
+			sh := &t.shards[i]
+			var expired []string
+			sh.mu.Lock()
+			for el := sh.order.Back(); el != nil && el.Value.(*sessionEntry).lastUsed.Before(cutoff); el = sh.order.Back() {
+				expired = append(expired, t.removeLocked(sh, el))
+			}
+			sh.mu.Unlock()
+
+			for _, id := range expired {
+				tls_client_cffi.RemoveSession(id)
+			}
+		}
+	}
+}
+
 func mergeRelative(srcURL string, redirURL string) (string, error) {
 	parsedRed, err := url.Parse(redirURL)
 	if err != nil {
@@ -317,6 +524,9 @@ func request(requestInput *ExtendedRequestInput) *Response {
 	if err != nil {
 		return handleErrorResponse(sessionId, withSession, err)
 	}
+	if withSession {
+		sessions.touch(sessionId)
+	}
 
 	req, err := tls_client_cffi.BuildRequest(requestInput.RequestInput)
 	if err != nil {
@@ -373,7 +583,12 @@ func BuildResponse(
 		resp.Body = http.DecompressBodyByType(resp.Body, ce)
 	}
 
-	respBodyBytes, err = io.ReadAll(resp.Body)
+	// a HEAD response advertises the Content-Length of a body it never sends
+	sizeHint := resp.ContentLength
+	if resp.Request != nil && resp.Request.Method == http.MethodHead {
+		sizeHint = 0
+	}
+	respBodyBytes, err = readBody(resp.Body, sizeHint)
 
 	if err != nil {
 		clientErr := tls_client_cffi.NewTLSClientError(err)
@@ -385,7 +600,14 @@ func BuildResponse(
 	isBase64 := detect && !utf8.Valid(respBodyBytes)
 	if isBase64 {
 		finalResponse = base64.StdEncoding.EncodeToString(respBodyBytes)
+	} else if cap(respBodyBytes)-len(respBodyBytes) <= len(respBodyBytes) {
+		// respBodyBytes is never touched again, so alias it as the string
+		// instead of copying the whole body
+		finalResponse = unsafe.String(unsafe.SliceData(respBodyBytes), len(respBodyBytes))
 	} else {
+		// the alias would pin the whole backing array; when most of it is
+		// unused (e.g. a short body under a large Content-Length), copy
+		// exactly the body instead
 		finalResponse = string(respBodyBytes)
 	}
 
@@ -411,6 +633,26 @@ func BuildResponse(
 	return response, nil
 }
 
+// upper bound on how much a Content-Length header may preallocate. Larger
+// bodies start from this size and grow as data actually arrives, so an
+// upstream can't force a big allocation by declaring a length it never sends
+const maxBodyPrealloc = 4 << 20
+
+func readBody(body io.Reader, sizeHint int64) ([]byte, error) {
+	// io.ReadAll starts small and regrows, copying large bodies several
+	// times over. Use Content-Length (the compressed size when the body is
+	// encoded, so still a useful lower bound) to size the buffer up front
+	if sizeHint <= 0 {
+		return io.ReadAll(body)
+	}
+	if sizeHint > maxBodyPrealloc {
+		sizeHint = maxBodyPrealloc
+	}
+	buf := bytes.NewBuffer(make([]byte, 0, sizeHint+bytes.MinRead))
+	_, err := buf.ReadFrom(body)
+	return buf.Bytes(), err
+}
+
 func cookiesToMap(cookies []*http.Cookie) map[string]string {
 	ret := make(map[string]string, 0)
 
@@ -0,0 +1,91 @@
+package main
+
+import (
+	"fmt"
+	"sort"
+	"sync"
+	"testing"
+)
+
+func withSessionLimits(t *testing.T, max int) {
+	// maxSessions and sessionTTL are package-level; restore them afterwards
+	prevMax, prevTTL := maxSessions, sessionTTL
+	maxSessions, sessionTTL = max, 0
+	t.Cleanup(func() { maxSessions, sessionTTL = prevMax, prevTTL })
+}
+
+func trackedIds(tr *sessionTracker) []string {
+	var ids []string
+	for i := range tr.shards {
+		sh := &tr.shards[i]
+		sh.mu.Lock()
+		for el := sh.order.Front(); el != nil; el = el.Next() {
+			ids = append(ids, el.Value.(*sessionEntry).id)
+		}
+		sh.mu.Unlock()
+	}
+	sort.Strings(ids)
+	return ids
+}
+
+func TestSessionTrackerEvictsLeastRecentlyUsed(t *testing.T) {
+	withSessionLimits(t, 4)
+	tr := newSessionTracker()
+
+	// 40 sessions land across every shard; s0 is touched after each one
+	for i := 0; i < 40; i++ {
+		tr.touch(fmt.Sprintf("s%d", i))
+		tr.touch("s0")
+	}
+
+	ids := trackedIds(tr)
+	want := []string{"s0", "s37", "s38", "s39"}
+	if fmt.Sprint(ids) != fmt.Sprint(want) {
+		t.Fatalf("tracked sessions = %v, want %v", ids, want)
+	}
+	if n := tr.count.Load(); n != int64(len(ids)) {
+		t.Fatalf("count = %d, but %d sessions are tracked", n, len(ids))
+	}
+}
+
+func TestSessionTrackerConcurrentTouchForget(t *testing.T) {
+	withSessionLimits(t, 4)
+	tr := newSessionTracker()
+
+	var wg sync.WaitGroup
+	for g := 0; g < 8; g++ {
+		wg.Add(1)
+		go func(g int) {
+			defer wg.Done()
+			for i := 0; i < 2000; i++ {
+				id := fmt.Sprintf("g%d-%d", g, i%50)
+				tr.touch(id)
+				if i%7 == 0 {
+					tr.forget(id)
+				}
+			}
+		}(g)
+	}
+	wg.Wait()
+
+	ids := trackedIds(tr)
+	if len(ids) > maxSessions {
+		t.Fatalf("%d sessions tracked, want at most %d", len(ids), maxSessions)
+	}
+	if n := tr.count.Load(); n != int64(len(ids)) {
+		t.Fatalf("count = %d, but %d sessions are tracked", n, len(ids))
+	}
+}
+
+func TestSessionTrackerReset(t *testing.T) {
+	withSessionLimits(t, 4)
+	tr := newSessionTracker()
+	for i := 0; i < 3; i++ {
+		tr.touch(fmt.Sprintf("s%d", i))
+	}
+
+	tr.reset()
+	if ids := trackedIds(tr); len(ids) != 0 || tr.count.Load() != 0 {
+		t.Fatalf("after reset: tracked %v, count %d", ids, tr.count.Load())
+	}
+}
@@ -27,6 +27,36 @@ const OS_MAP: Record<string, OSName> = {
 };
 import type { TLSSession } from '../session.js';
 
+function envLaunchLimit(value: string | undefined): number {
+  const n = Number.parseInt(value ?? '', 10);
+  return Number.isFinite(n) && n > 0 ? n : Infinity;
+}
+
+// Each launch starts a full browser process. HREQUESTS_MAX_BROWSER_LAUNCHES
+// caps how many can start at once (further launches queue until a slot
+// frees up); unset or 0 leaves launches unlimited. Read once at load
+const MAX_CONCURRENT_LAUNCHES = envLaunchLimit(process.env.HREQUESTS_MAX_BROWSER_LAUNCHES);
+let activeLaunches = 0;
+const launchQueue: Array<() => void> = [];
+
+async function acquireLaunchSlot(): Promise<void> {
+  if (activeLaunches < MAX_CONCURRENT_LAUNCHES) {
+    activeLaunches++;
+    return;
+  }
+  await new Promise<void>(resolve => launchQueue.push(resolve));
+}
+
+function releaseLaunchSlot(): void {
+  // Hand the slot straight to the next waiter, if any
+  const next = launchQueue.shift();
+  if (next) {
+    next();
+  } else {
+    activeLaunches--;
+  }
+}
+
 export type BrowserType = 'firefox' | 'chrome';
 
 export interface BrowserSessionOptions {
@@ -134,6 +164,18 @@ export class BrowserSession {
    * Initialize the browser
    */
   async init(): Promise<void> {
+    await acquireLaunchSlot();
+    try {
+      await this.launch();
+    } finally {
+      releaseLaunchSlot();
+    }
+  }
+
+  /**
+   * Launch the browser, context and page
+   */
+  private async launch(): Promise<void> {
     const proxyConfig = this.proxy?.toPlaywright();
 
     // Camoufox handles all fingerprinting by default
@@ -1,4 +1,5 @@
 import koffi from 'koffi';
+import { Pool } from 'undici';
 import { createRequire } from 'node:module';
 import { platform, arch } from 'node:os';
 import { MissingLibraryException } from './exceptions.js';
@@ -11,10 +12,15 @@ const GoString = koffi.struct('GoString', {
   n: 'longlong' // Go's int is 64-bit on 64-bit systems. Use longlong to be safe for 64-bit targets which are the main ones.
 });
 
+// How long an idle bridge socket is kept for reuse. Must stay below the
+// bridge's own IdleTimeout (90s) so the server never closes it first
+const BRIDGE_KEEP_ALIVE_MS = 60_000;
+
 export class BridgeManager {
   private binPath: string = '';
   private lib: any = null;
   private port: number = 0;
+  private dispatcher: Pool | null = null;
   private loadPromise: Promise<void> | null = null;
 
   private resolveBinPath(): string {
@@ -74,6 +80,16 @@ export class BridgeManager {
       const portStr = String(this.port);
       StartServer({ p: portStr, n: portStr.length });
 
+      // Dedicated connection pool for bridge traffic, so requests to the
+      // bridge never queue behind the process-wide undici dispatcher.
+      // Each POST holds its socket until the upstream request finishes, so
+      // the pool is left unbounded like the global dispatcher it replaces
+      this.dispatcher = new Pool(`http://127.0.0.1:${this.port}`, {
+        connections: null,
+        keepAliveTimeout: BRIDGE_KEEP_ALIVE_MS,
+        keepAliveMaxTimeout: BRIDGE_KEEP_ALIVE_MS,
+      });
+
       console.log(`Bridge server started on port ${this.port}`);
     })();
 
@@ -84,7 +100,18 @@ export class BridgeManager {
     return this.port;
   }
 
+  getDispatcher(): Pool {
+    if (!this.dispatcher) {
+      throw new Error("Bridge is not loaded");
+    }
+    return this.dispatcher;
+  }
+
   stop() {
+    if (this.dispatcher) {
+      void this.dispatcher.close();
+      this.dispatcher = null;
+    }
     if (this.lib && this.lib.functions) {
       this.lib.functions.StopServer();
       // koffi.unload(this.lib); // Koffi doesn't support full unload usually, but we can stop the server.
@@ -4,8 +4,8 @@
  * Mirrors the Python hrequests TLSClient
  */
 
+import { randomUUID } from 'node:crypto';
 import { fetch } from 'undici';
-import { v4 as uuidv4 } from 'uuid';
 import { bridge } from './cffi.js';
 import { CaseInsensitiveDict } from './toolbelt.js';
 import { RequestsCookieJar, cookiejarToList, listToCookiejar, extractCookiesToJar } from './cookies.js';
@@ -18,6 +18,11 @@ const PROXY_PATTERN = new RegExp(
   `^(?:${SUPPORTED_PROXIES.join('|')})://(?:[^:]+:[^@]+@)?.*?(?::\\d+)?$`
 );
 
+// Most requests sent in one /multirequest call. The bridge buffers every
+// response of a call into a single JSON body, so this bounds its size and
+// how many requests one failed round trip takes down with it
+const MULTIREQUEST_MAX_BATCH = 16;
+
 /**
  * Verify that a proxy URL is valid
  */
@@ -189,10 +194,11 @@ export class TLSClient {
   readonly headerPriority?: HeaderPriority;
 
   private _closed: boolean = false;
+  private _customTlsProfile: Record<string, unknown> | null = null;
   private _headers: CaseInsensitiveDict;
 
   constructor(options: TLSClientOptions = {}) {
-    this.id = uuidv4();
+    this.id = randomUUID();
     this.clientIdentifier = options.clientIdentifier;
     this.randomTlsExtensionOrder = options.randomTlsExtensionOrder ?? true;
     this.forceHttp1 = options.forceHttp1 ?? false;
@@ -360,7 +366,22 @@ export class TLSClient {
 
     if (this.clientIdentifier === undefined) {
       // Use custom TLS profile
-      payload.customTlsClient = {
+      payload.customTlsClient = this.customTlsProfile();
+    } else {
+      payload.tlsClientIdentifier = this.clientIdentifier;
+      payload.withRandomTLSExtensionOrder = this.randomTlsExtensionOrder;
+    }
+
+    return { payload, headers: mergedHeaders };
+  }
+
+  /**
+   * Custom TLS profile sent with every request. Its fields are readonly,
+   * so it is built once and reused rather than rebuilt per request
+   */
+  private customTlsProfile(): Record<string, unknown> {
+    if (this._customTlsProfile === null) {
+      this._customTlsProfile = {
         ja3String: this.ja3String,
         h2Settings: this.h2Settings,
         h2SettingsOrder: this.h2SettingsOrder,
@@ -374,12 +395,8 @@ export class TLSClient {
         supportedDelegatedCredentialsAlgorithms: this.supportedDelegatedCredentialsAlgorithms,
         keyShareCurves: this.keyShareCurves,
       };
-    } else {
-      payload.tlsClientIdentifier = this.clientIdentifier;
-      payload.withRandomTLSExtensionOrder = this.randomTlsExtensionOrder;
     }
-
-    return { payload, headers: mergedHeaders };
+    return this._customTlsProfile;
   }
 
   /**
@@ -390,24 +407,94 @@ export class TLSClient {
     url: string,
     options: TLSRequestOptions = {}
   ): Promise<BridgeResponse> {
+    const { payload, headers } = this.buildRequest(method, url, options);
+    const responseObject = await TLSClient.postToBridge<BridgeResponseWrapper>('/request', payload);
+
+    try {
+      return this.buildResponse(url, headers, responseObject, payload.proxyUrl as string | undefined);
+    } catch (e) {
+      if (e instanceof ClientException) throw e;
+      throw new ClientException(`Request failed: ${e}`);
+    }
+  }
+
+  /**
+   * Execute several requests, possibly on different clients, via the
+   * bridge's /multirequest endpoint, in concurrent calls of at most
+   * MULTIREQUEST_MAX_BATCH requests. Results are returned in order;
+   * a request that failed yields its Error instead of a response
+   */
+  static async executeRequests(
+    calls: Array<{ client: TLSClient; method: string; url: string; options?: TLSRequestOptions }>
+  ): Promise<Array<BridgeResponse | Error>> {
+    const results: Array<BridgeResponse | Error> = new Array(calls.length);
+
+    const built: Array<{ index: number; payload: Record<string, unknown>; headers: CaseInsensitiveDict }> = [];
+    calls.forEach(({ client, method, url, options }, index) => {
+      try {
+        built.push({ index, ...client.buildRequest(method, url, options) });
+      } catch (e) {
+        results[index] = e as Error;
+      }
+    });
+    if (built.length === 0) {
+      return results;
+    }
+
+    const chunks: Array<typeof built> = [];
+    for (let i = 0; i < built.length; i += MULTIREQUEST_MAX_BATCH) {
+      chunks.push(built.slice(i, i + MULTIREQUEST_MAX_BATCH));
+    }
+    await Promise.all(chunks.map(async chunk => {
+      let responseObjects: BridgeResponseWrapper[];
+      try {
+        responseObjects = await TLSClient.postToBridge<BridgeResponseWrapper[]>(
+          '/multirequest',
+          chunk.map(b => b.payload)
+        );
+      } catch (e) {
+        const error = e instanceof ClientException ? e : new ClientException(`Request failed: ${e}`);
+        for (const { index } of chunk) {
+          results[index] = error;
+        }
+        return;
+      }
+
+      chunk.forEach(({ index, payload, headers }, i) => {
+        const { client, url } = calls[index];
+        try {
+          const response = client.buildResponse(url, headers, responseObjects[i], payload.proxyUrl as string | undefined);
+          response.elapsed = responseObjects[i].elapsed;
+          results[index] = response;
+        } catch (e) {
+          results[index] = e as Error;
+        }
+      });
+    }));
+    return results;
+  }
+
+  /**
+   * POST a JSON body to a bridge endpoint and parse the JSON reply.
+   * Transport and HTTP errors are raised as ClientException
+   */
+  private static async postToBridge<T>(path: string, body: unknown): Promise<T> {
     // Ensure bridge is loaded (idempotent — caches in-flight/resolved promise)
     await bridge.load();
 
-    const { payload, headers } = this.buildRequest(method, url, options);
-
     try {
-      const resp = await fetch(`http://127.0.0.1:${bridge.getPort()}/request`, {
+      const resp = await fetch(`http://127.0.0.1:${bridge.getPort()}${path}`, {
         method: 'POST',
-        body: JSON.stringify(payload),
+        body: JSON.stringify(body),
         headers: { 'Content-Type': 'application/json' },
+        dispatcher: bridge.getDispatcher(),
       });
 
       if (!resp.ok) {
         throw new ClientException(`Bridge request failed: ${resp.statusText}`);
       }
 
-      const responseObject = await resp.json() as any;
-      return this.buildResponse(url, headers, responseObject, payload.proxyUrl as string | undefined);
+      return await resp.json() as T;
     } catch (e) {
       if (e instanceof ClientException) throw e;
       throw new ClientException(`Request failed: ${e}`);
@@ -420,11 +507,11 @@ export class TLSClient {
   private buildResponse(
     url: string,
     headers: CaseInsensitiveDict,
-    responseObject: any,
+    responseObject: BridgeResponseWrapper,
     proxy?: string
   ): BridgeResponse {
     if (!responseObject.isHistory) {
-      return this.buildResponseObj(url, headers, responseObject.response || responseObject, proxy);
+      return this.buildResponseObj(url, headers, responseObject.response || (responseObject as unknown as BridgeResponseData), proxy);
     }
 
     const history: BridgeResponse[] = [];
@@ -453,7 +540,7 @@ export class TLSClient {
   private buildResponseObj(
     url: string,
     headers: CaseInsensitiveDict,
-    res: any,
+    res: BridgeResponseData,
     proxy?: string
   ): BridgeResponse {
     if (res.status === 0) {
@@ -481,11 +568,14 @@ export class TLSClient {
     }
 
     // Decode base64 body if needed
-    let body: Buffer;
+    let body: Buffer | undefined;
+    let text: string | undefined;
     if (res.isBase64) {
       body = Buffer.from(res.body, 'base64');
     } else {
-      body = Buffer.from(res.body || '');
+      // Keep the already-decoded string so Response.text/json() don't
+      // decode the bytes a second time; Response builds raw from it lazily
+      text = res.body || '';
     }
 
     return {
@@ -494,6 +584,7 @@ export class TLSClient {
       headers: new CaseInsensitiveDict(resHeaders),
       cookies: responseCookieJar,
       body,
+      text,
       isUtf8: !res.isBase64,
       proxy,
       history: [],
@@ -501,14 +592,44 @@ export class TLSClient {
   }
 }
 
+/**
+ * A single response as serialized by the bridge (Response in bridge/server.go)
+ */
+interface BridgeResponseData {
+  id: string;
+  body: string;
+  cookies: Record<string, string> | null;
+  headers: Record<string, string[]> | null;
+  sessionId?: string;
+  status: number;
+  target: string;
+  usedProtocol: string;
+  isBase64?: boolean;
+}
+
+/**
+ * Bridge reply for one request (ResponseWrapper in bridge/server.go)
+ */
+interface BridgeResponseWrapper {
+  isHistory: boolean;
+  response?: BridgeResponseData;
+  history?: BridgeResponseData[];
+  elapsed?: number;
+}
+
 export interface BridgeResponse {
   url: string;
   statusCode: number;
   headers: CaseInsensitiveDict;
   cookies: RequestsCookieJar;
-  body: Buffer;
+  /** Body bytes, unset when the bridge sent the body as text */
+  body?: Buffer;
+  /** Body as received from the bridge, when it was valid UTF-8 */
+  text?: string;
   isUtf8: boolean;
   proxy?: string;
   history: BridgeResponse[];
+  /** Milliseconds the bridge spent on this request, when it reports it */
+  elapsed?: number;
 }
 
@@ -22,6 +22,33 @@ const KWARG_MAP: Record<string, string> = {
   'http_equiv': 'http-equiv',
 };
 
+// Parse templates ("Price: {price}") compiled to named-group regexes
+const TEMPLATE_FIELD = /\{(\w+)\}/;
+const REGEX_SPECIAL = /[.*+?^${}()|[\]\\]/g;
+const TEMPLATE_CACHE_SIZE = 256;
+const templateCache = new Map<string, RegExp>();
+
+/**
+ * Compile a parse template into a RegExp, caching the result.
+ * Literal text is escaped so only {name} fields act as wildcards
+ */
+function compileTemplate(template: string, flags: string = ''): RegExp {
+  const key = `${flags}:${template}`;
+  let regex = templateCache.get(key);
+  if (!regex) {
+    const source = template
+      .split(TEMPLATE_FIELD)
+      .map((part, i) => (i % 2 ? `(?<${part}>.+?)` : part.replace(REGEX_SPECIAL, '\\$&')))
+      .join('');
+    regex = new RegExp(source, flags);
+    if (templateCache.size >= TEMPLATE_CACHE_SIZE) {
+      templateCache.delete(templateCache.keys().next().value!);
+    }
+    templateCache.set(key, regex);
+  }
+  return regex;
+}
+
 /**
  * An element of HTML
  */
@@ -208,9 +235,7 @@ export class Element {
    * Search the Element for the given parse template
    */
   search(template: string): Record<string, string> | null {
-    // Simple template parsing - looks for {name} patterns
-    const regex = template.replace(/\{(\w+)\}/g, '(?<$1>.+?)');
-    const match = this.html.match(new RegExp(regex));
+    const match = this.html.match(compileTemplate(template));
     if (match && match.groups) {
       return match.groups;
     }
@@ -221,8 +246,7 @@ export class Element {
    * Search the Element multiple times for the given parse template
    */
   searchAll(template: string): Array<Record<string, string>> {
-    const regex = template.replace(/\{(\w+)\}/g, '(?<$1>.+?)');
-    const matches = this.html.matchAll(new RegExp(regex, 'g'));
+    const matches = this.html.matchAll(compileTemplate(template, 'g'));
     const results: Array<Record<string, string>> = [];
     for (const match of matches) {
       if (match.groups) {
@@ -134,6 +134,42 @@ export class TLSRequest {
     return this;
   }
 
+  /**
+   * Send a group of requests to the bridge through /multirequest.
+   * Afterwards each request is in the same state send() would leave it in;
+   * failures are recorded on the request rather than thrown
+   */
+  static async sendAll(requests: TLSRequest[]): Promise<void> {
+    for (const req of requests) {
+      // Rebuild session if it was closed
+      if (req.session === null) {
+        req._buildSession();
+      }
+    }
+
+    try {
+      const results = await TLSSession.requestMany(requests.map(req => ({
+        session: req.session!,
+        method: req.method,
+        url: req.url,
+        options: req.kwargs,
+      })));
+
+      results.forEach((result, i) => {
+        if (result instanceof Error) {
+          requests[i].exception = result;
+          requests[i].traceback = result.stack;
+        } else {
+          requests[i].response = result;
+        }
+      });
+    } finally {
+      for (const req of requests) {
+        req.closeSession();
+      }
+    }
+  }
+
   /**
    * Close the session if it was created by this request
    */
@@ -390,34 +426,29 @@ export async function map(
   for (let i = 0; i < requestList.length; i += batchSize) {
     const batch = requestList.slice(i, Math.min(i + batchSize, requestList.length));
 
-    // Send all requests in batch concurrently
-    const promises = batch.map(async (req) => {
-      // Build session if needed
-      if (req.session === null) {
-        (req as any)._buildSession();
+    // Send the batch through the bridge's /multirequest endpoint
+    await TLSRequest.sendAll(batch);
+
+    for (const req of batch) {
+      if (req.response !== null) {
+        allResponses.push(req.response);
+        continue;
       }
 
-      try {
-        await req.send();
-        return req.response;
-      } catch (e) {
-        const error = e as Error;
-        if (req.raiseException) {
-          throw error;
-        }
+      const error = req.exception ?? new Error('Request was not sent');
+      if (req.raiseException) {
+        throw error;
+      }
 
-        if (exceptionHandler) {
-          return exceptionHandler(req, error);
+      if (exceptionHandler) {
+        const result = exceptionHandler(req, error);
+        if (result !== null) {
+          allResponses.push(result);
         }
-
-        return new FailedResponse(error);
-      } finally {
-        req.closeSession();
+      } else {
+        allResponses.push(new FailedResponse(error));
       }
-    });
-
-    const results = await Promise.all(promises);
-    allResponses.push(...(results.filter(r => r !== null) as (Response | FailedResponse)[]));
+    }
   }
 
   return allResponses;
@@ -76,12 +76,17 @@ const STATUS_CODES: Record<number, string> = {
   511: 'Network Authentication Required',
 };
 
+const UTF8_ENCODING = /^utf-?8$/i;
+
 export interface ResponseOptions {
   url: string;
   statusCode: number;
   headers: CaseInsensitiveDict | Record<string, string>;
   cookies: RequestsCookieJar;
-  raw: Buffer | string;
+  /** Body bytes. May be omitted when text is given */
+  raw?: Buffer | string;
+  /** Pre-decoded UTF-8 body. When raw is omitted it is encoded on demand */
+  text?: string;
   history?: Response[];
   session?: TLSSession | BrowserSession | null;
   browser?: 'firefox' | 'chrome';
@@ -112,7 +117,6 @@ export class Response {
   readonly statusCode: number;
   readonly headers: CaseInsensitiveDict;
   readonly cookies: RequestsCookieJar;
-  readonly raw: Buffer;
 
   history: Response[];
   session: TLSSession | BrowserSession | null;
@@ -124,7 +128,9 @@ export class Response {
   proxy?: string;
 
   private _html: HTML | null = null;
+  private _raw: Buffer | null = null;
   private _text: string | null = null;
+  private _links: Record<string, Record<string, string>> | null = null;
 
   constructor(options: ResponseOptions) {
     this.url = options.url;
@@ -133,7 +139,9 @@ export class Response {
       ? options.headers
       : new CaseInsensitiveDict(options.headers);
     this.cookies = options.cookies;
-    this.raw = Buffer.isBuffer(options.raw) ? options.raw : Buffer.from(options.raw);
+    if (options.raw !== undefined) {
+      this._raw = Buffer.isBuffer(options.raw) ? options.raw : Buffer.from(options.raw);
+    }
     this.history = options.history || [];
     this.session = options.session || null;
     this.browser = options.browser;
@@ -144,6 +152,32 @@ export class Response {
 
     // Detect encoding
     this.encoding = options.encoding || this._detectEncoding();
+
+    // Reuse the caller's decoded body instead of decoding raw again.
+    // Otherwise keep only the bytes, so the body is not held twice
+    if (options.text !== undefined) {
+      if (UTF8_ENCODING.test(this.encoding)) {
+        this._text = options.text;
+      } else if (this._raw === null) {
+        this._raw = Buffer.from(options.text);
+      }
+    }
+  }
+
+  /**
+   * Response body as bytes, encoded from the text on first access
+   * when the response was built from a decoded body
+   */
+  get raw(): Buffer {
+    if (this._raw === null) {
+      this._raw = Buffer.from(this._text ?? '');
+    }
+    return this._raw;
+  }
+
+  set raw(value: Buffer) {
+    this._raw = value;
+    this._text = null;
   }
 
   /**
@@ -159,6 +193,11 @@ export class Response {
       }
     }
 
+    // A body given only as text is UTF-8 already
+    if (this._raw === null) {
+      return 'utf-8';
+    }
+
     // Check for BOM
     if (this.raw.length >= 3) {
       // UTF-8 BOM
@@ -248,19 +287,19 @@ export class Response {
    * Returns the parsed header links of the response, if any
    */
   get links(): Record<string, Record<string, string>> {
-    const header = this.headers.get('Link');
-    const resolvedLinks: Record<string, Record<string, string>> = {};
-
-    if (!header) {
-      return resolvedLinks;
-    }
-
-    const links = parseHeaderLinks(header);
-    for (const link of links) {
-      const key = link.rel || link.url;
-      resolvedLinks[key] = link;
+    if (this._links === null) {
+      const header = this.headers.get('Link');
+      const resolvedLinks: Record<string, Record<string, string>> = {};
+
+      if (header) {
+        for (const link of parseHeaderLinks(header)) {
+          const key = link.rel || link.url;
+          resolvedLinks[key] = link;
+        }
+      }
+      this._links = resolvedLinks;
     }
-    return resolvedLinks;
+    return this._links;
   }
 
   /**
@@ -3,10 +3,10 @@
  * Mirrors the Python hrequests session module with full functionality
  */
 
-import { TLSClient, type TLSClientOptions, type TLSRequestOptions } from './client.js';
+import { TLSClient, type BridgeResponse, type TLSClientOptions, type TLSRequestOptions } from './client.js';
 import { Response, buildResponse, type ResponseOptions } from './response.js';
 import { CaseInsensitiveDict, FileUtils, type FileInput } from './toolbelt.js';
-import { RequestsCookieJar, mergeCookies, cookiejarFromDict, extractCookiesToJar } from './cookies.js';
+import { RequestsCookieJar, mergeCookies, extractCookiesToJar } from './cookies.js';
 import { render, BrowserSession, type BrowserSessionOptions } from './browser/index.js';
 import {
   generateHeaders,
@@ -20,10 +20,15 @@ import {
 } from './browser/fingerprint.js';
 import { Proxy } from './browser/proxy.js';
 import { bridge } from './cffi.js';
+import { ClientException } from './exceptions.js';
 
 export type Method = 'GET' | 'POST' | 'PUT' | 'DELETE' | 'PATCH' | 'HEAD' | 'OPTIONS';
 export type OSType = 'win' | 'mac' | 'lin';
 
+const SUPPORTED_METHODS: ReadonlySet<string> = new Set<Method>([
+  'GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS',
+]);
+
 export interface TLSSessionOptions extends TLSClientOptions {
   /** Browser to use [firefox, chrome] */
   browser: BrowserName;
@@ -213,6 +218,81 @@ export class TLSSession extends TLSClient {
     url: string,
     options: RequestOptions = {}
   ): Promise<Response> {
+    const [finalMethod, finalUrl, tlsOptions] = await this.prepareRequest(method, url, options);
+
+    // Record start time
+    const startTime = Date.now();
+
+    // Execute request
+    const bridgeResponse = await this.executeRequest(finalMethod, finalUrl, tlsOptions);
+
+    return this.toResponse(bridgeResponse, Date.now() - startTime);
+  }
+
+  /**
+   * Send several requests (on any sessions) through the bridge's /multirequest.
+   * Results are returned in order; a failed request yields its Error
+   */
+  static async requestMany(
+    calls: Array<{ session: TLSSession; method: Method; url: string; options?: RequestOptions }>
+  ): Promise<Array<Response | Error>> {
+    const results: Array<Response | Error> = new Array(calls.length);
+
+    // Prepare every request first, so one bad request doesn't sink the batch
+    const prepared = await Promise.all(calls.map(async ({ session, method, url, options }) => {
+      try {
+        return await session.prepareRequest(method, url, options);
+      } catch (e) {
+        return e as Error;
+      }
+    }));
+
+    const pending: number[] = [];
+    for (let i = 0; i < calls.length; i++) {
+      const p = prepared[i];
+      if (p instanceof Error) {
+        results[i] = p;
+      } else {
+        pending.push(i);
+      }
+    }
+
+    const startTime = Date.now();
+    const bridgeResponses = await TLSClient.executeRequests(pending.map(i => {
+      const [method, url, options] = prepared[i] as [Method, string, TLSRequestOptions];
+      return { client: calls[i].session, method, url, options };
+    }));
+    const batchElapsed = Date.now() - startTime;
+
+    // Prefer the bridge's per-request timing; every request in the batch
+    // would otherwise report the time of the slowest one
+    pending.forEach((callIndex, j) => {
+      const res = bridgeResponses[j];
+      results[callIndex] = res instanceof Error
+        ? res
+        : calls[callIndex].session.toResponse(res, res.elapsed ?? batchElapsed);
+    });
+    return results;
+  }
+
+  /**
+   * Normalize request options into the TLS client's request format
+   */
+  private async prepareRequest(
+    method: Method,
+    url: string,
+    options: RequestOptions = {}
+  ): Promise<[Method, string, TLSRequestOptions]> {
+    // Reject unsupported methods before any header or body work. Only
+    // non-canonical spellings (e.g. 'get') pay for a case conversion
+    if (!SUPPORTED_METHODS.has(method)) {
+      const normalized = String(method).toUpperCase();
+      if (!SUPPORTED_METHODS.has(normalized)) {
+        throw new ClientException(`Unsupported HTTP method: ${method}`);
+      }
+      method = normalized as Method;
+    }
+
     await this.ensureHeadersInitialized();
     const {
       data,
@@ -257,38 +337,39 @@ export class TLSSession extends TLSClient {
       proxyUrl = proxy instanceof Proxy ? proxy.url : proxy;
     }
 
-    // Record start time
-    const startTime = Date.now();
-
-    // Execute request
-    const bridgeResponse = await this.executeRequest(method, finalUrl, {
+    return [method, finalUrl, {
       data: requestData,
       headers: requestHeaders,
-      cookies: cookies instanceof RequestsCookieJar ? cookies : cookies ? cookiejarFromDict(cookies) : undefined,
+      // Plain cookie dicts are merged into the session jar as-is; building
+      // a throwaway jar from them first only doubled the work
+      cookies,
       json,
       allowRedirects,
       history,
       verify: verify ?? this.defaultVerify,
       timeout: timeout ?? this.defaultTimeout,
       proxy: proxyUrl,
-    });
-
-    // Calculate elapsed time
-    const elapsed = Date.now() - startTime;
+    }];
+  }
 
-    // Build response
-    const response = new Response({
+  /**
+   * Build a Response from a bridge response
+   */
+  private toResponse(bridgeResponse: BridgeResponse, elapsed: number): Response {
+    return new Response({
       url: bridgeResponse.url,
       statusCode: bridgeResponse.statusCode,
       headers: bridgeResponse.headers,
       cookies: bridgeResponse.cookies,
       raw: bridgeResponse.body,
+      text: bridgeResponse.text,
       history: bridgeResponse.history.map(h => new Response({
         url: h.url,
         statusCode: h.statusCode,
         headers: h.headers,
         cookies: h.cookies,
         raw: h.body,
+        text: h.text,
         isUtf8: h.isUtf8,
         proxy: h.proxy,
       })),
@@ -299,8 +380,6 @@ export class TLSSession extends TLSClient {
       isUtf8: bridgeResponse.isUtf8,
       proxy: bridgeResponse.proxy,
     });
-
-    return response;
   }
 
   // HTTP method shortcuts
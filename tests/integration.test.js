@@ -1,4 +1,4 @@
-import hrequests, { shutdown } from "../dist/index.js";
+import hrequests, { shutdown, ClientException, FailedResponse, asyncGet } from "../dist/index.js";
 
 const IP_ENDPOINT = "https://httpbin.org/headers";
 
@@ -34,6 +34,59 @@ async function testRotation() {
     // If it's always the same, rotation might not be working or pool is 1.
 }
 
+async function testMethodValidation() {
+    console.log('Testing Method Validation...');
+    const session = new hrequests.Session({ browser: 'chrome' });
+    try {
+        // Lowercase methods are normalized rather than rejected
+        const resp = await session.request('get', IP_ENDPOINT);
+        if (resp.statusCode !== 200) {
+            throw new Error(`Expected 200 for lowercase 'get', got ${resp.statusCode}`);
+        }
+
+        // Unknown methods fail fast with ClientException
+        let rejected = false;
+        try {
+            await session.request('FETCH', IP_ENDPOINT);
+        } catch (e) {
+            if (!(e instanceof ClientException)) throw e;
+            rejected = true;
+        }
+        if (!rejected) {
+            throw new Error("Expected ClientException for unsupported method 'FETCH'");
+        }
+    } finally {
+        session.close();
+    }
+}
+
+async function testMapFailures() {
+    console.log('Testing map() Failure Handling...');
+    // The .invalid TLD never resolves, so this request always fails
+    const badUrl = "https://hrequests-test.invalid/";
+
+    // Without a handler, a failed request becomes a FailedResponse in place
+    const responses = await hrequests.map([asyncGet(IP_ENDPOINT), asyncGet(badUrl)]);
+    if (responses.length !== 2 || responses[0].statusCode !== 200 || !(responses[1] instanceof FailedResponse)) {
+        throw new Error(`Expected [Response, FailedResponse], got ${responses.map(String)}`);
+    }
+
+    // With a handler, the handler gets the failed request and its result is used
+    const handled = [];
+    const withHandler = await hrequests.map([asyncGet(badUrl), asyncGet(IP_ENDPOINT)], {
+        exceptionHandler: (req, e) => {
+            handled.push([req.url, e]);
+            return null;
+        },
+    });
+    if (handled.length !== 1 || handled[0][0] !== badUrl || !(handled[0][1] instanceof Error)) {
+        throw new Error(`Expected exceptionHandler to be called once for ${badUrl}`);
+    }
+    if (withHandler.length !== 1 || withHandler[0].statusCode !== 200) {
+        throw new Error('Expected only the successful response when the handler returns null');
+    }
+}
+
 async function testRender(browser) {
     console.log(`Testing Render with ${browser}...`);
     // Using a simpler page for speed
@@ -73,6 +126,8 @@ async function main() {
         await testBridgeRequest('chrome', 'Chrome');
         await testBridgeRequest('firefox', 'Firefox');
         await testRotation();
+        await testMethodValidation();
+        await testMapFailures();
 
         await testRender('chrome');
         await testRender('firefox');
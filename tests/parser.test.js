@@ -0,0 +1,42 @@
+import { HTML } from "../dist/index.js";
+
+function assertEqual(actual, expected, label) {
+  if (JSON.stringify(actual) !== JSON.stringify(expected)) {
+    throw new Error(`${label}: expected ${JSON.stringify(expected)}, got ${JSON.stringify(actual)}`);
+  }
+}
+
+function main() {
+  const html = new HTML("<p>Total: $4.99 (incl. tax)</p><p>Total: $12.50 (incl. tax)</p>");
+
+  // Regex characters in the template are matched literally
+  assertEqual(
+    { ...html.search("Total: ${amount} (incl. tax)") },
+    { amount: "4.99" },
+    "search with literal $ . ( )"
+  );
+  assertEqual(
+    html.searchAll("Total: ${amount} (incl. tax)").map((groups) => groups.amount),
+    ["4.99", "12.50"],
+    "searchAll with literal $ . ( )"
+  );
+
+  // "." must not act as a wildcard
+  assertEqual(new HTML("<p>fooXbar</p>").search("foo.{rest}"), null, "literal dot");
+
+  // Multiple {name} fields still capture
+  assertEqual(
+    { ...new HTML("<p>Name: Ada, Age: 36.</p>").search("Name: {name}, Age: {age}.") },
+    { name: "Ada", age: "36" },
+    "multiple fields"
+  );
+
+  console.log("Parser template test passed!");
+}
+
+try {
+  main();
+} catch (error) {
+  console.error(error);
+  process.exitCode = 1;
+}